@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries expire after a fixed time
+
+    As with cachetools, maxsize bounds the total of getsizeof over the cached
+    values, which counts each value as 1 by default.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        getsizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.getsizeof = getsizeof
+        self.currsize = 0
+        self._entries: OrderedDict[K, tuple[float, int, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Get a cached value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, _, value = entry
+            if expires < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Cache a value, evicting the least recently used entries if full
+
+        Values larger than the whole cache are not stored.
+        """
+        size = self.getsizeof(value) if self.getsizeof else 1
+        with self._lock:
+            self._remove(key)
+            if size > self.maxsize:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self.currsize += size
+            while self.currsize > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def pop(self, key: K) -> None:
+        """Remove a value from the cache if present"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all values from the cache"""
+        with self._lock:
+            self._entries.clear()
+            self.currsize = 0
+
+    def _remove(self, key: K) -> None:
+        """Remove a value if present, with the lock held"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.currsize -= entry[1]
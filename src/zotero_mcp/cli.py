@@ -1,7 +1,5 @@
 import argparse
 
-from zotero_mcp import mcp
-
 
 def main():
     parser = argparse.ArgumentParser(description="Zotero Model Contect Server")
@@ -13,6 +11,9 @@ def main():
     )
     args = parser.parse_args()
 
+    # Imported here so argument errors and --help don't wait on server setup
+    from zotero_mcp.server import mcp
+
     mcp.run(args.transport)
 
 
@@ -1,49 +1,321 @@
+from __future__ import annotations
+
+import functools
 import os
-from typing import Any
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from zotero_mcp.cache import TTLCache
+
+if TYPE_CHECKING:
+    from pyzotero import zotero
+
+
+# Environment variable values that enable a boolean setting
+TRUTHY_VALUES = frozenset({"true", "yes", "1", "on", "y", "t"})
 
-from dotenv import load_dotenv
-from pydantic import BaseModel
-from pyzotero import zotero
+# pyzotero keeps per-request state on the client, so each thread gets its own
+_thread_clients = threading.local()
 
+# Incremented to discard the clients cached by every thread
+_client_generation = 0
 
-# Load environment variables
-load_dotenv()
+
+@dataclass(slots=True, frozen=True)
+class _ZoteroConfig:
+    """Zotero connection settings read from the environment"""
+
+    library_id: str | None
+    library_type: str
+    api_key: str | None
+    local: bool
 
 
 # Initialize Zotero client
 def get_zotero_client() -> zotero.Zotero:
-    """Get authenticated Zotero client using environment variables"""
-    library_id = os.getenv("ZOTERO_LIBRARY_ID")
-    library_type = os.getenv("ZOTERO_LIBRARY_TYPE", "user")
-    api_key = os.getenv("ZOTERO_API_KEY")
-    local = os.getenv("ZOTERO_LOCAL", "").lower() in ["true", "yes", "1"]
-    if local and not library_id:
+    """Get authenticated Zotero client using environment variables
+
+    Clients are built once per thread and configuration and then reused, so
+    their HTTP connection pools are shared between tool invocations. Call
+    get_zotero_client.cache_clear() to rebuild them. The environment is read
+    on the first call, and again after reload_config().
+    """
+    config = _load_config()
+    cache_key = (_client_generation, config)
+    if getattr(_thread_clients, "cache_key", None) != cache_key:
+        _thread_clients.client = _build_zotero_client(config)
+        _thread_clients.cache_key = cache_key
+    return _thread_clients.client
+
+
+@functools.cache
+def _load_config() -> _ZoteroConfig:
+    """Read the configuration from the environment once"""
+    _load_dotenv()
+    return _ZoteroConfig(
+        library_id=os.getenv("ZOTERO_LIBRARY_ID"),
+        library_type=os.getenv("ZOTERO_LIBRARY_TYPE", "user"),
+        api_key=os.getenv("ZOTERO_API_KEY"),
+        local=os.getenv("ZOTERO_LOCAL", "").lower() in TRUTHY_VALUES,
+    )
+
+
+def reload_config() -> None:
+    """Reread the configuration from the environment on the next request
+
+    Clients are rebuilt if the configuration has changed.
+    """
+    _load_config.cache_clear()
+
+
+@functools.cache
+def _load_dotenv() -> None:
+    """Load environment variables once, without overriding any already set"""
+    # Imported here as it is only needed when the first client is built
+    from dotenv import find_dotenv, load_dotenv
+
+    if dotenv_path := find_dotenv(usecwd=True):
+        load_dotenv(dotenv_path, override=False)
+
+
+def _clear_zotero_clients() -> None:
+    """Discard cached clients so each thread builds a new one"""
+    global _client_generation
+    _client_generation += 1
+
+
+# Mirrors functools.lru_cache so callers can reset the cached clients
+get_zotero_client.cache_clear = _clear_zotero_clients
+
+
+def _build_zotero_client(config: _ZoteroConfig) -> zotero.Zotero:
+    """Construct a Zotero client for the given configuration"""
+    # Imported here as these are slow to load and not needed until first use
+    from pyzotero import zotero
+
+    from zotero_mcp.transport import shared_http_client
+
+    library_id = config.library_id
+    if config.local and not library_id:
         # Indicates "current user" for the local API
         library_id = "0"
 
-    if not local or all([library_id, api_key]):
+    if not config.local and not all([library_id, config.api_key]):
         raise ValueError(
             "Missing required environment variables. Please set ZOTERO_LIBRARY_ID and ZOTERO_API_KEY"
         )
 
-    return zotero.Zotero(
+    zot = zotero.Zotero(
         library_id=library_id,
-        library_type=library_type,
-        api_key=api_key,
-        local=local,
+        library_type=config.library_type,
+        api_key=config.api_key,
+        local=config.local,
     )
+    # pyzotero doesn't accept a client, so swap in the pool shared by all threads
+    zot.client.close()
+    zot.client = shared_http_client(zot.default_headers(), _client_generation)
+    return zot
+
+
+# Cached responses for items, their children, and their full text, by item key
+item_cache: TTLCache[str, Any] = TTLCache(maxsize=1024, ttl=300)
+children_cache: TTLCache[str, Any] = TTLCache(maxsize=1024, ttl=300)
+# Full texts can run to megabytes, so these are bounded by total length
+fulltext_cache: TTLCache[str, Any] = TTLCache(
+    maxsize=32 * 1024 * 1024,
+    ttl=300,
+    getsizeof=lambda fulltext: 1 + len((fulltext or {}).get("content", "")),
+)
+
+# Seconds between checks of the library for items changed since being cached
+VERSION_CHECK_INTERVAL = 30.0
+
+
+class _CachedVersion:
+    """Library version to check for changes to cached responses since
+
+    Checks must start no later than the oldest cached response, so the
+    version only advances past the changes a completed check has seen.
+    Responses cached meanwhile are checked from their own versions.
+    """
+
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self.pending: int | None = None
+        self.checked = time.monotonic()
+        self.lock = threading.Lock()
+
+    def observe(self, items: list[dict[str, Any]]) -> None:
+        """Record the versions of newly cached items"""
+        with self.lock:
+            for item in items:
+                version = item.get("version", 0)
+                if self.pending is None or version < self.pending:
+                    self.pending = version
+
+    def due(self) -> int | None:
+        """Get the version to check for changes since, if a check is due"""
+        with self.lock:
+            now = time.monotonic()
+            versions = [v for v in (self.version, self.pending) if v is not None]
+            if not versions or now - self.checked < VERSION_CHECK_INTERVAL:
+                return None
+            self.checked = now
+            self.version = min(versions)
+            self.pending = None
+            return self.version
+
+    def advance(self, since: int, changed: dict[str, int]) -> None:
+        """Record the changes seen by a completed check"""
+        with self.lock:
+            if self.version == since and changed:
+                self.version = max(changed.values())
+
+    def clear(self) -> None:
+        """Forget the versions of all cached responses"""
+        with self.lock:
+            self.version = self.pending = None
+
+
+_cached_version = _CachedVersion()
+
+
+def evict_changed_items(zot: zotero.Zotero) -> None:
+    """Evict cached responses for items modified since they were fetched"""
+    since = _cached_version.due()
+    if since is None:
+        return
+
+    try:
+        changed: Any = zot.item_versions(since=since)
+    except Exception:
+        # The check is only for freshness, so serve the cache and try again
+        # after the next interval
+        return
+    if not changed:
+        return
+    for key in changed:
+        item_cache.pop(key)
+        fulltext_cache.pop(key)
+    # Changed items may be children of cached parents
+    children_cache.clear()
+    attachment_cache.clear()
+    _cached_version.advance(since, changed)
+
+
+def cached_item(zot: zotero.Zotero, item_key: str) -> Any:
+    """Get an item, reusing a recently fetched response"""
+    evict_changed_items(zot)
+    item = item_cache.get(item_key)
+    if item is None:
+        item = zot.item(item_key)
+        if item:
+            item_cache.set(item_key, item)
+            _cached_version.observe([item])
+    return item
+
+
+def cached_children(zot: zotero.Zotero, item_key: str) -> Any:
+    """Get an item's child attachments, reusing a recently fetched response
+
+    Notes and other children are filtered out by the API, since only
+    attachments are of use and heavily annotated items can have many.
+    """
+    evict_changed_items(zot)
+    children = children_cache.get(item_key)
+    if children is None:
+        children = zot.children(item_key, itemType="attachment")
+        children_cache.set(item_key, children)
+        _cached_version.observe(children)
+    return children
+
+
+def cached_fulltext(zot: zotero.Zotero, item_key: str) -> Any:
+    """Get an attachment's full text, reusing a recently fetched response"""
+    evict_changed_items(zot)
+    fulltext = fulltext_cache.get(item_key)
+    if fulltext is None:
+        fulltext = zot.fulltext_item(item_key)
+        fulltext_cache.set(item_key, fulltext)
+    return fulltext
 
 
-class AttachmentDetails(BaseModel):
+def invalidate_item(item_key: str) -> None:
+    """Evict cached responses for an item after modifying it
+
+    Pass the parent's key after adding or removing its attachments.
+    """
+    for cache in (item_cache, children_cache, fulltext_cache, attachment_cache):
+        cache.pop(item_key)
+
+
+def clear_caches() -> None:
+    """Empty all response caches"""
+    for cache in (item_cache, children_cache, fulltext_cache, attachment_cache):
+        cache.clear()
+    _cached_version.clear()
+
+
+@dataclass(slots=True, frozen=True)
+class AttachmentDetails:
+    """Key and content type of the attachment to read an item's text from"""
+
     key: str
     content_type: str
 
 
+# Priority of attachment content types to read text from, with any other
+# type ranked after these
+_PRIORITIES = {"application/pdf": 0, "text/html": 1}
+
+# Best attachments of items, by item key
+attachment_cache: TTLCache[str, AttachmentDetails] = TTLCache(maxsize=2048, ttl=300)
+
+
+def get_linked_attachment(item: dict[str, Any]) -> AttachmentDetails | None:
+    """Get the attachment that the Zotero API links from an item
+
+    The API links its own choice of best attachment, which ranks differently
+    from get_attachment_details, so the link is only used when the item has
+    a single child and the two can't disagree.
+    """
+    link = item.get("links", {}).get("attachment")
+    if not link or item.get("meta", {}).get("numChildren") != 1:
+        return None
+    return AttachmentDetails(
+        key=link["href"].rsplit("/", 1)[-1],
+        content_type=link.get("attachmentType", ""),
+    )
+
+
 def get_attachment_details(
     zot: zotero.Zotero,
     item: dict[str, Any],
+    children: list[dict[str, Any]] | None = None,
+) -> AttachmentDetails | None:
+    """Get attachment ID and content type for a Zotero item
+
+    Already fetched children of the item may be passed to avoid a request.
+    Attachments found are cached by item key for later lookups.
+    """
+    item_key = item.get("data", {}).get("key")
+    if item_key and (attachment := attachment_cache.get(item_key)) is not None:
+        return attachment
+
+    attachment = _find_attachment(zot, item, children)
+    if item_key and attachment is not None:
+        attachment_cache.set(item_key, attachment)
+    return attachment
+
+
+def _find_attachment(
+    zot: zotero.Zotero,
+    item: dict[str, Any],
+    children: list[dict[str, Any]] | None,
 ) -> AttachmentDetails | None:
-    """Get attachment ID and content type for a Zotero item"""
+    """Find the best attachment of a Zotero item or the item itself"""
     data = item.get("data", {})
     item_type = data.get("itemType")
 
@@ -56,46 +328,39 @@ def get_attachment_details(
         )
 
     # For regular items, look for child attachments
-    try:
-        children: Any = zot.children(data.get("key", ""))
-        # Group attachments by content type and size
-        pdfs = []
-        htmls = []
-        others = []
-
-        for child in children:
-            child_data = child.get("data", {})
-            if child_data.get("itemType") == "attachment":
-                content_type = child_data.get("contentType")
-                file_size = child_data.get("md5", "")  # Use md5 as proxy for size
-
-                if content_type == "application/pdf":
-                    pdfs.append((child_data.get("key"), content_type, file_size))
-                elif content_type == "text/html":
-                    htmls.append((child_data.get("key"), content_type, file_size))
-                else:
-                    others.append((child_data.get("key"), content_type, file_size))
-
-        # Return first match in priority order
-        if pdfs:
-            pdfs.sort(key=lambda x: x[2], reverse=True)
-            return AttachmentDetails(
-                key=pdfs[0][0],
-                content_type=pdfs[0][1],
-            )
-        if htmls:
-            htmls.sort(key=lambda x: x[2], reverse=True)
-            return AttachmentDetails(
-                key=htmls[0][0],
-                content_type=htmls[0][1],
-            )
-        if others:
-            others.sort(key=lambda x: x[2], reverse=True)
+    if item.get("meta", {}).get("numChildren") == 0:
+        return None
+    if children is None:
+        # Imported here as pyzotero is slow to load and not needed until first use
+        from pyzotero import zotero_errors
+
+        try:
+            children = cached_children(zot, data.get("key", ""))
+        except zotero_errors.ResourceNotFound:
+            # Rate limits and server errors propagate so the call can be retried
+            return None
+
+    # Track the largest attachment of each content type, by priority
+    best: list[dict[str, Any] | None] = [None] * (len(_PRIORITIES) + 1)
+    best_sizes = [-1] * len(best)
+
+    for child in children:
+        child_data = child.get("data", {})
+        if child_data.get("itemType") != "attachment":
+            continue
+        priority = _PRIORITIES.get(child_data.get("contentType"), len(_PRIORITIES))
+        # Stored files report their size on the download link
+        size = child.get("links", {}).get("enclosure", {}).get("length") or 0
+        if size > best_sizes[priority]:
+            best[priority] = child_data
+            best_sizes[priority] = size
+
+    # Return first match in priority order
+    for child_data in best:
+        if child_data is not None:
             return AttachmentDetails(
-                key=others[0][0],
-                content_type=others[0][1],
+                key=child_data.get("key"),
+                content_type=child_data.get("contentType"),
             )
-    except Exception:
-        pass
 
     return None
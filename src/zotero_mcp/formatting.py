@@ -0,0 +1,72 @@
+from collections.abc import Iterable
+from typing import Any
+
+
+def format_creator(creator: dict[str, Any]) -> str:
+    """Format a Zotero creator's name, or an empty string if it has none"""
+    if "firstName" in creator and "lastName" in creator:
+        return f"{creator['lastName']}, {creator['firstName']}"
+    return creator.get("name", "")
+
+
+def format_creators(creators: Iterable[dict[str, Any]]) -> str:
+    """Format a Zotero item's creators as a semicolon separated string"""
+    return "; ".join(name for creator in creators if (name := format_creator(creator)))
+
+
+def format_item(item: dict[str, Any]) -> str:
+    """Format a Zotero item's metadata as a readable string"""
+    get = item["data"].get
+    creators = format_creators(get("creators", ()))
+    abstract = get("abstractNote")
+    tags = get("tags")
+    url = get("url")
+    doi = get("DOI")
+    notes = item.get("meta", {}).get("numChildren", 0)
+
+    # Optional fields are falsy when absent and left out of the output
+    formatted = (
+        f"Title: {get('title', 'Untitled')}",
+        f"Type: {get('itemType', 'unknown')}",
+        f"Date: {get('date', 'No date')}",
+        creators and f"Authors: {creators}",
+        abstract and f"\nAbstract:\n{abstract}",
+        tags and f"\nTags: {', '.join(tag['tag'] for tag in tags)}",
+        url and f"URL: {url}",
+        doi and f"DOI: {doi}",
+        notes and f"Number of notes: {notes}",
+    )
+    return "\n".join(filter(None, formatted))
+
+
+# Item data fields that are library bookkeeping rather than metadata
+OMITTED_ITEM_FIELDS = frozenset(
+    {"version", "collections", "relations", "dateAdded", "dateModified"}
+)
+
+
+def item_metadata(item: dict[str, Any]) -> dict[str, Any]:
+    """Get a Zotero item's metadata fields"""
+    metadata = {
+        field: value
+        for field, value in item["data"].items()
+        if field not in OMITTED_ITEM_FIELDS
+    }
+    if num_children := item.get("meta", {}).get("numChildren"):
+        metadata["numChildren"] = num_children
+    return metadata
+
+
+def search_result(item: dict[str, Any]) -> dict[str, Any]:
+    """Get the summary of a Zotero item shown in search results"""
+    get = item["data"].get
+    return {
+        "key": item.get("key", ""),
+        "title": get("title", "Untitled"),
+        "itemType": get("itemType", "unknown"),
+        "date": get("date", ""),
+        "authors": [
+            name for creator in get("creators", ()) if (name := format_creator(creator))
+        ],
+        "abstract": get("abstractNote", ""),
+    }
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import tempfile
+from typing import TYPE_CHECKING, Any, Callable, Literal, TypeVar
+
+from mcp.server.fastmcp import FastMCP
+
+from zotero_mcp.client import (
+    AttachmentDetails,
+    attachment_cache,
+    cached_children,
+    cached_fulltext,
+    cached_item,
+    get_attachment_details,
+    get_linked_attachment,
+    get_zotero_client,
+    item_cache,
+)
+from zotero_mcp.formatting import format_item, item_metadata, search_result
+
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
+    from pyzotero import zotero
+
+# Create an MCP server
+mcp = FastMCP("Zotero")
+
+# Most items the Zotero API returns in a single response
+PAGE_SIZE = 100
+
+# Number of leading search results whose attachments are looked up ahead of
+# a fulltext request, as those are the results most likely to be opened
+PREFETCH_LIMIT = 5
+
+# Running prefetches, referenced so they aren't collected before finishing
+prefetch_tasks: set[asyncio.Task[Any]] = set()
+
+T = TypeVar("T")
+
+
+@functools.cache
+def get_markitdown() -> MarkItDown:
+    """Get the converter for attachments without indexed full text"""
+    # Imported here as it is slow to load and rarely needed
+    from markitdown import MarkItDown
+
+    return MarkItDown()
+
+
+async def with_client(func: Callable[[zotero.Zotero], T]) -> T:
+    """Run a blocking Zotero call in a worker thread, using that thread's client"""
+    return await asyncio.to_thread(lambda: func(get_zotero_client()))
+
+
+async def get_attachment_details_bulk(
+    items: list[dict[str, Any]],
+) -> list[AttachmentDetails | BaseException | None]:
+    """Get attachment details for several items, looking them up concurrently
+
+    Lookups that fail give their exception rather than cancelling the others.
+    """
+    return await asyncio.gather(
+        *(
+            with_client(functools.partial(get_attachment_details, item=item))
+            for item in items
+        ),
+        return_exceptions=True,
+    )
+
+
+@mcp.tool(
+    name="zotero_item_metadata",
+    description="Get metadata information about a specific Zotero item, given the item key.",
+)
+async def get_item_metadata(item_key: str) -> dict[str, Any] | str:
+    """Get metadata information about a specific Zotero item"""
+    try:
+        item: Any = await with_client(lambda zot: cached_item(zot, item_key))
+        if not item:
+            return f"No item found with key: {item_key}"
+        return item_metadata(item)
+    except Exception as e:
+        return f"Error retrieving item metadata: {str(e)}"
+
+
+def fetch_children(zot: zotero.Zotero, item_key: str) -> list[dict[str, Any]] | None:
+    """Get the child attachments of an item, or None if they can't be retrieved"""
+    try:
+        return cached_children(zot, item_key)
+    except Exception:
+        return None
+
+
+def fetch_attachment_text(zot: zotero.Zotero, attachment_key: str) -> str:
+    """Get the text of an attachment, converting the file if it isn't indexed"""
+    # Imported here as pyzotero is slow to load and not needed until first use
+    from pyzotero import zotero_errors
+
+    try:
+        full_text_data: Any = cached_fulltext(zot, attachment_key)
+        if full_text_data and "content" in full_text_data:
+            return full_text_data["content"]
+        return "[Attachment available but text extraction not possible]"
+    except zotero_errors.ResourceNotFound:
+        # Not indexed, so convert the file instead, leaving rate limits and
+        # server errors to be reported rather than making a heavier request
+        file = zot.file(attachment_key)
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp_pdf:
+            tmp_pdf.write(file)
+            tmp_pdf.flush()
+            return get_markitdown().convert(tmp_pdf.name).text_content
+
+
+@mcp.tool(
+    name="zotero_item_fulltext",
+    description="Get the full text content of a Zotero item, given the item key of a parent item or specific attachment.",
+)
+async def get_item_fulltext(item_key: str) -> str:
+    """Get the full text content of a specific Zotero item"""
+    try:
+        attachment = attachment_cache.get(item_key)
+        if attachment is not None:
+            # The attachment is known from a search, so fetch text alongside the item
+            item, item_text = await asyncio.gather(
+                with_client(lambda zot: cached_item(zot, item_key)),
+                with_client(lambda zot: fetch_attachment_text(zot, attachment.key)),
+            )
+            if not item:
+                return f"No item found with key: {item_key}"
+        else:
+            if item_cache.get(item_key) is not None:
+                # Children are fetched below only if the item reports any
+                item = await with_client(lambda zot: cached_item(zot, item_key))
+                children = None
+            else:
+                # Most items have attachments, so fetch children alongside it
+                item, children = await asyncio.gather(
+                    with_client(lambda zot: cached_item(zot, item_key)),
+                    with_client(lambda zot: fetch_children(zot, item_key)),
+                )
+            if not item:
+                return f"No item found with key: {item_key}"
+
+            # Fetch full-text content
+            attachment = await with_client(
+                lambda zot: get_attachment_details(zot, item, children)
+            )
+            if attachment is not None:
+                item_text = await with_client(
+                    lambda zot: fetch_attachment_text(zot, attachment.key)
+                )
+            else:
+                item_text = "[No suitable attachment found for full text extraction]"
+
+        return (
+            f"{format_item(item)}\n\n"
+            f"Attachment Item Key: {attachment.key if attachment else ''}\n\n"
+            f"Full Text:\n{item_text}"
+        )
+    except Exception as e:
+        return f"Error retrieving item full text: {str(e)}"
+
+
+@mcp.tool(
+    name="zotero_search_items",
+    # More detail can be added if useful: https://www.zotero.org/support/dev/web_api/v3/basics#searching
+    description="Search for items in your Zotero library, given a query string, query mode (titleCreatorYear or everything), and optional tag search (supports boolean searches). Returned results can be looked up with zotero_get_fulltext or zotero_get_metadata.",
+)
+async def search_items(
+    query: str,
+    qmode: Literal["titleCreatorYear", "everything"] = "titleCreatorYear",
+    tag: str = None,
+    limit: int = 10,
+) -> list[dict[str, Any]] | str:
+    """Search for items in your Zotero library"""
+
+    def search(zot: zotero.Zotero, **params: Any) -> Any:
+        # Search using the q parameter
+        zot.add_parameters(q=query, qmode=qmode, **params)
+        return zot.items()
+
+    # n.b. types for this return do not work, it's a parsed JSON object
+    results: Any
+    if limit <= PAGE_SIZE:
+        results = await with_client(functools.partial(search, limit=limit))
+    else:
+        # The API caps each response, so request all the pages concurrently
+        pages = await asyncio.gather(
+            *(
+                with_client(
+                    functools.partial(
+                        search, limit=min(PAGE_SIZE, limit - start), start=start
+                    )
+                )
+                for start in range(0, limit, PAGE_SIZE)
+            )
+        )
+        results = [item for page in pages for item in page]
+
+    if not results:
+        return "No items found matching your query."
+
+    # Resolve attachments of the top results in the background, caching them
+    # so fulltext lookups can skip the children, leaving any that fail to be
+    # retried by the fulltext lookup
+    unlinked = []
+    for item in results:
+        if attachment := get_linked_attachment(item):
+            attachment_cache.set(item["key"], attachment)
+        elif len(unlinked) < PREFETCH_LIMIT:
+            unlinked.append(item)
+    if unlinked:
+        task = asyncio.create_task(get_attachment_details_bulk(unlinked))
+        prefetch_tasks.add(task)
+        task.add_done_callback(prefetch_tasks.discard)
+
+    return [search_result(item) for item in results]
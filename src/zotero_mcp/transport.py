@@ -0,0 +1,174 @@
+import functools
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from zotero_mcp.cache import TTLCache
+
+
+# Response headers that no longer apply once a body has been decoded
+_ENCODING_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+# Response headers asking the client to slow down, which replayed bodies omit
+_THROTTLE_HEADERS = frozenset({"backoff", "retry-after"})
+
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport that retries idempotent requests on transient errors"""
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.3,
+        status_forcelist: frozenset[int] = frozenset({429, 500, 502, 503, 504}),
+        allowed_methods: frozenset[str] = frozenset({"GET"}),
+        max_backoff: float = 10.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = status_forcelist
+        self.allowed_methods = allowed_methods
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = super().handle_request(request)
+            if (
+                attempt >= self.total
+                or request.method not in self.allowed_methods
+                or response.status_code not in self.status_forcelist
+            ):
+                return response
+            delay = self._retry_delay(response, attempt)
+            if delay > self.max_backoff:
+                # Waiting that long would hold up the tool call, so give up
+                return response
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Get the seconds to wait before retrying, preferring the server's"""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2**attempt
+
+
+class ConditionalTransport(RetryTransport):
+    """HTTP transport that revalidates repeated reads by library version
+
+    Zotero responses carry a Last-Modified-Version header. When the same URL
+    is requested again, the version is sent as If-Modified-Since-Version so
+    an unchanged response comes back as an empty 304, which is answered
+    from the body cached here.
+    """
+
+    # Largest response body to keep, enough for a full page of search results
+    # while leaving out files
+    MAX_CACHED_BODY = 512 * 1024
+
+    def __init__(self, maxbytes: int = 16 * 1024 * 1024, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # Entries are revalidated on every use, so the TTL only bounds memory,
+        # as does the total size of the cached bodies
+        self.responses: TTLCache[str, tuple[str, list[tuple[str, str]], bytes]] = (
+            TTLCache(maxsize=maxbytes, ttl=3600, getsizeof=lambda entry: len(entry[2]))
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        # Full texts are already kept decoded by the client's fulltext cache
+        if request.method != "GET" or request.url.path.endswith("/fulltext"):
+            return super().handle_request(request)
+
+        url = str(request.url)
+        cached = self.responses.get(url)
+        if cached is not None:
+            request.headers["If-Modified-Since-Version"] = cached[0]
+
+        response = super().handle_request(request)
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            _, stored_headers, body = cached
+            # The live response's headers, such as a fresh Backoff, take
+            # precedence over those stored with the body
+            headers = httpx.Headers(stored_headers)
+            for name, value in response.headers.items():
+                if name not in _ENCODING_HEADERS:
+                    headers[name] = value
+            return httpx.Response(200, headers=headers, content=body, request=request)
+
+        version = response.headers.get("Last-Modified-Version")
+        if response.status_code != 200 or not version:
+            return response
+
+        body = response.read()
+        # The body is read decoded, so drop headers describing its encoding
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name not in _ENCODING_HEADERS
+        ]
+        if len(body) <= self.MAX_CACHED_BODY:
+            # Throttling requests only apply to the response they came with
+            stored_headers = [
+                (name, value)
+                for name, value in headers
+                if name not in _THROTTLE_HEADERS
+            ]
+            self.responses.set(url, (version, stored_headers, body))
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+
+class SharedClient:
+    """Handle to an HTTP client that is shared between Zotero clients
+
+    pyzotero closes its HTTP client when it is garbage collected, so each
+    Zotero client is given a handle whose close() leaves the pool open.
+    """
+
+    def __init__(self, client: httpx.Client) -> None:
+        self.client = client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def close(self) -> None:
+        """Leave the shared client open for its other users"""
+
+
+_shared_client_lock = threading.Lock()
+
+
+def shared_http_client(headers: dict[str, str], generation: int = 0) -> SharedClient:
+    """Get a handle to the pooled HTTP client for the given default headers
+
+    A new generation builds a fresh pool, leaving the old one to be collected.
+    """
+    with _shared_client_lock:
+        return SharedClient(_build_http_client(tuple(headers.items()), generation))
+
+
+@functools.lru_cache(maxsize=1)
+def _build_http_client(
+    headers: tuple[tuple[str, str], ...], generation: int
+) -> httpx.Client:
+    """Construct the pooled HTTP client used by every thread's Zotero client"""
+    return httpx.Client(
+        headers=dict(headers),
+        # The local API server closes idle HTTP/1.0 connections, so reopen
+        # the socket once rather than failing the request, ride out transient
+        # server errors and rate limits with backoff, and skip downloading
+        # responses that haven't changed since they were last read
+        transport=ConditionalTransport(retries=1),
+        # Enough connections for every worker thread to have a request open
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=32),
+        follow_redirects=True,
+    )
@@ -6,51 +6,74 @@ from unittest.mock import MagicMock
 import pytest
 from pyzotero import zotero
 
+from zotero_mcp.client import clear_caches as clear_client_caches, reload_config
+
+
+_SAMPLE_ITEM: dict[str, Any] = {
+    "key": "ABCD1234",
+    "data": {
+        "key": "ABCD1234",
+        "itemType": "journalArticle",
+        "title": "Test Article",
+        "date": "2024",
+        "creators": [
+            {"firstName": "John", "lastName": "Doe"},
+            {"firstName": "Jane", "lastName": "Smith"},
+        ],
+        "abstractNote": "This is a test abstract",
+        "tags": [{"tag": "test"}, {"tag": "article"}],
+        "url": "https://example.com",
+        "DOI": "10.1234/test",
+    },
+    "meta": {"numChildren": 2},
+}
+
+_SAMPLE_ATTACHMENT: dict[str, Any] = {
+    "key": "XYZ789",
+    "data": {
+        "key": "XYZ789",
+        "itemType": "attachment",
+        "contentType": "application/pdf",
+        "md5": "123456789",
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Fixture that empties module-level caches between tests"""
+    clear_client_caches()
+    reload_config()
+
+
+@pytest.fixture(scope="session")
+def zotero_spec_mock() -> MagicMock:
+    """Fixture that builds the mocked Zotero client once, as specs are slow"""
+    return MagicMock(spec_set=zotero.Zotero)
+
 
 @pytest.fixture
-def mock_zotero(monkeypatch) -> MagicMock:
+def mock_zotero(monkeypatch, zotero_spec_mock: MagicMock) -> MagicMock:
     """Fixture that returns a mocked Zotero client"""
-    mock = MagicMock(spec=zotero.Zotero)
+    zotero_spec_mock.reset_mock(return_value=True, side_effect=True)
 
     def mock_get_zotero_client():
-        return mock
+        return zotero_spec_mock
 
-    monkeypatch.setattr("zotero_mcp.get_zotero_client", mock_get_zotero_client)
-    return mock
+    monkeypatch.setattr("zotero_mcp.server.get_zotero_client", mock_get_zotero_client)
+    return zotero_spec_mock
 
 
 @pytest.fixture
 def sample_item() -> dict[str, Any]:
-    """Fixture that returns a sample Zotero item"""
-    return {
-        "key": "ABCD1234",
-        "data": {
-            "key": "ABCD1234",
-            "itemType": "journalArticle",
-            "title": "Test Article",
-            "date": "2024",
-            "creators": [
-                {"firstName": "John", "lastName": "Doe"},
-                {"firstName": "Jane", "lastName": "Smith"},
-            ],
-            "abstractNote": "This is a test abstract",
-            "tags": [{"tag": "test"}, {"tag": "article"}],
-            "url": "https://example.com",
-            "DOI": "10.1234/test",
-        },
-        "meta": {"numChildren": 2},
-    }
+    """Fixture that returns a sample Zotero item
+
+    The item is shared between tests, so tests adjusting it must copy it.
+    """
+    return _SAMPLE_ITEM
 
 
 @pytest.fixture
 def sample_attachment() -> dict[str, Any]:
     """Fixture that returns a sample Zotero attachment item"""
-    return {
-        "key": "XYZ789",
-        "data": {
-            "key": "XYZ789",
-            "itemType": "attachment",
-            "contentType": "application/pdf",
-            "md5": "123456789",
-        },
-    }
+    return _SAMPLE_ATTACHMENT
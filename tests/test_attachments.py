@@ -0,0 +1,108 @@
+"""Tests for choosing and caching the attachments of items"""
+
+from typing import Any
+
+import pytest
+from pyzotero import zotero_errors
+
+from zotero_mcp.client import get_attachment_details, invalidate_item
+
+
+def test_get_attachment_details_without_children(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that items without children skip the children lookup"""
+    sample_item = {**sample_item, "meta": {"numChildren": 0}}
+
+    assert get_attachment_details(mock_zotero, sample_item) is None
+    mock_zotero.children.assert_not_called()
+
+
+def test_get_attachment_details_priority(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that PDFs are preferred over larger attachments of other types"""
+    mock_zotero.children.return_value = [
+        {
+            "data": {"key": "NOTE1", "itemType": "note"},
+        },
+        {
+            "data": {
+                "key": "HTML1",
+                "itemType": "attachment",
+                "contentType": "text/html",
+            },
+            "links": {"enclosure": {"length": 500000}},
+        },
+        {
+            "data": {
+                "key": "PDF1",
+                "itemType": "attachment",
+                "contentType": "application/pdf",
+            },
+            "links": {"enclosure": {"length": 1000}},
+        },
+    ]
+
+    attachment = get_attachment_details(mock_zotero, sample_item)
+
+    assert attachment is not None
+    assert attachment.key == "PDF1"
+    assert attachment.content_type == "application/pdf"
+
+
+def test_get_attachment_details_cached(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that attachments are remembered by item key"""
+    first = get_attachment_details(mock_zotero, sample_item, [sample_attachment])
+
+    assert get_attachment_details(mock_zotero, sample_item) is first
+    mock_zotero.children.assert_not_called()
+
+
+def test_get_attachment_details_ties_keep_first(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that the first of equally sized attachments is used"""
+    duplicate = {"data": {**sample_attachment["data"], "key": "DUP456"}}
+
+    attachment = get_attachment_details(
+        mock_zotero, sample_item, [sample_attachment, duplicate]
+    )
+
+    assert attachment is not None
+    assert attachment.key == "XYZ789"
+
+
+def test_invalidate_item(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that invalidating an item refetches its children"""
+    mock_zotero.children.return_value = [sample_attachment]
+    get_attachment_details(mock_zotero, sample_item)
+
+    invalidate_item("ABCD1234")
+    mock_zotero.children.return_value = []
+
+    assert get_attachment_details(mock_zotero, sample_item) is None
+    assert mock_zotero.children.call_count == 2
+
+
+def test_get_attachment_details_missing_item(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that items removed from the library have no attachment"""
+    mock_zotero.children.side_effect = zotero_errors.ResourceNotFound("Not found")
+
+    assert get_attachment_details(mock_zotero, sample_item) is None
+
+
+def test_get_attachment_details_rate_limited(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that rate limits are raised rather than treated as no attachment"""
+    mock_zotero.children.side_effect = zotero_errors.TooManyRequests("Slow down")
+
+    with pytest.raises(zotero_errors.TooManyRequests):
+        get_attachment_details(mock_zotero, sample_item)
@@ -0,0 +1,81 @@
+"""Tests for Zotero client construction"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from zotero_mcp.client import get_zotero_client, reload_config
+
+
+@pytest.fixture(autouse=True)
+def local_env(monkeypatch) -> None:
+    """Configure the environment for the local Zotero API"""
+    monkeypatch.setenv("ZOTERO_LOCAL", "true")
+    monkeypatch.delenv("ZOTERO_LIBRARY_ID", raising=False)
+    monkeypatch.delenv("ZOTERO_API_KEY", raising=False)
+
+
+def test_get_zotero_client_is_reused() -> None:
+    """Test that repeated calls share a single client"""
+    assert get_zotero_client() is get_zotero_client()
+
+
+def test_get_zotero_client_cache_clear() -> None:
+    """Test that clearing the cache produces a new client"""
+    first = get_zotero_client()
+
+    get_zotero_client.cache_clear()
+
+    assert get_zotero_client() is not first
+
+
+def test_get_zotero_client_rebuilt_on_config_change(monkeypatch) -> None:
+    """Test that a reloaded configuration change produces a new client"""
+    first = get_zotero_client()
+
+    monkeypatch.setenv("ZOTERO_LIBRARY_TYPE", "group")
+    assert get_zotero_client() is first
+
+    reload_config()
+    second = get_zotero_client()
+
+    assert second is not first
+    assert second.library_type == "groups"
+
+
+@pytest.mark.parametrize("value", ["true", "Yes", "1", "on"])
+def test_get_zotero_client_local_values(monkeypatch, value: str) -> None:
+    """Test the values accepted for enabling the local API"""
+    monkeypatch.setenv("ZOTERO_LOCAL", value)
+
+    assert get_zotero_client().local
+
+
+def test_get_zotero_client_web_api(monkeypatch) -> None:
+    """Test that the web API is used when credentials are set"""
+    monkeypatch.setenv("ZOTERO_LOCAL", "false")
+    monkeypatch.setenv("ZOTERO_LIBRARY_ID", "12345")
+    monkeypatch.setenv("ZOTERO_API_KEY", "secret")
+
+    zot = get_zotero_client()
+
+    assert not zot.local
+    assert zot.client.headers["Authorization"] == "Bearer secret"
+
+
+def test_get_zotero_client_missing_credentials(monkeypatch) -> None:
+    """Test that the web API requires a library ID and API key"""
+    monkeypatch.setenv("ZOTERO_LOCAL", "false")
+
+    with pytest.raises(ValueError, match="Missing required environment variables"):
+        get_zotero_client()
+
+
+def test_get_zotero_client_per_thread() -> None:
+    """Test that each thread gets its own client sharing one connection pool"""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(get_zotero_client).result()
+    zot = get_zotero_client()
+
+    assert other is not zot
+    assert other.client.client is zot.client.client
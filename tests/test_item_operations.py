@@ -1,32 +1,38 @@
 """Tests for item metadata and fulltext operations"""
 
+import asyncio
 from typing import Any
 
-from zotero_mcp import get_item_metadata, get_item_fulltext
+from pyzotero import zotero_errors
+
+from zotero_mcp import get_item_fulltext, get_item_metadata, search_items
 
 
 def test_get_item_metadata(mock_zotero: Any, sample_item: dict[str, Any]) -> None:
     """Test retrieving item metadata"""
     mock_zotero.item.return_value = sample_item
 
-    result = get_item_metadata("ABCD1234")
+    result = asyncio.run(get_item_metadata("ABCD1234"))
 
-    assert "Title: Test Article" in result
-    assert "Type: journalArticle" in result
-    assert "Date: 2024" in result
-    assert "Authors: Doe, John; Smith, Jane" in result
-    assert "Abstract:\nThis is a test abstract" in result
-    assert "Tags: test, article" in result
-    assert "URL: https://example.com" in result
-    assert "DOI: 10.1234/test" in result
-    assert "Number of notes: 2" in result
+    assert result["title"] == "Test Article"
+    assert result["itemType"] == "journalArticle"
+    assert result["date"] == "2024"
+    assert result["creators"] == [
+        {"firstName": "John", "lastName": "Doe"},
+        {"firstName": "Jane", "lastName": "Smith"},
+    ]
+    assert result["abstractNote"] == "This is a test abstract"
+    assert result["tags"] == [{"tag": "test"}, {"tag": "article"}]
+    assert result["url"] == "https://example.com"
+    assert result["DOI"] == "10.1234/test"
+    assert result["numChildren"] == 2
 
 
 def test_get_item_metadata_not_found(mock_zotero: Any) -> None:
     """Test retrieving metadata for nonexistent item"""
     mock_zotero.item.return_value = None
 
-    result = get_item_metadata("NONEXISTENT")
+    result = asyncio.run(get_item_metadata("NONEXISTENT"))
 
     assert "No item found" in result
 
@@ -39,11 +45,36 @@ def test_get_item_fulltext(
     mock_zotero.children.return_value = [sample_attachment]
     mock_zotero.fulltext_item.return_value = {"content": "Sample full text content"}
 
-    result = get_item_fulltext("ABCD1234")
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    missing = {
+        "Title: Test Article",
+        "Type: journalArticle",
+        "Authors: Doe, John; Smith, Jane",
+        "Number of notes: 2",
+        "Attachment Item Key: XYZ789",
+        "Full Text:",
+        "Sample full text content",
+    } - set(result.splitlines())
+    assert not missing, missing
+    assert "\n\nAttachment Item Key: XYZ789\n\n" in result
+
+    # Children fetched alongside the item are reused for attachment lookup
+    mock_zotero.children.assert_called_once_with("ABCD1234", itemType="attachment")
+
+
+def test_get_item_fulltext_rate_limited(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that a rate limited full text isn't replaced by a file download"""
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.children.return_value = [sample_attachment]
+    mock_zotero.fulltext_item.side_effect = zotero_errors.TooManyRequests("Slow down")
 
-    assert "Test Article" in result
-    assert "Sample full text content" in result
-    assert "XYZ789" in result  # Attachment key
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    assert result == "Error retrieving item full text: Slow down"
+    mock_zotero.file.assert_not_called()
 
 
 def test_get_item_fulltext_no_attachment(
@@ -53,6 +84,174 @@ def test_get_item_fulltext_no_attachment(
     mock_zotero.item.return_value = sample_item
     mock_zotero.children.return_value = []
 
-    result = get_item_fulltext("ABCD1234")
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    assert "No suitable attachment found" in result
+
+
+def test_get_item_fulltext_after_search(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that attachments linked from search results skip the children lookup"""
+    sample_item = {
+        **sample_item,
+        "meta": {"numChildren": 1},
+        "links": {
+            "attachment": {
+                "href": "https://api.zotero.org/users/1/items/XYZ789",
+                "attachmentType": "application/pdf",
+            }
+        },
+    }
+    mock_zotero.items.return_value = [sample_item]
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.fulltext_item.return_value = {"content": "Sample full text content"}
+
+    asyncio.run(search_items("test"))
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    missing = {
+        "Attachment Item Key: XYZ789",
+        "Sample full text content",
+    } - set(result.splitlines())
+    assert not missing, missing
+    mock_zotero.children.assert_not_called()
+    mock_zotero.fulltext_item.assert_called_once_with("XYZ789")
+
+
+def test_get_item_metadata_cached(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that repeated metadata lookups reuse the cached item"""
+    mock_zotero.item.return_value = sample_item
+
+    asyncio.run(get_item_metadata("ABCD1234"))
+    result = asyncio.run(get_item_metadata("ABCD1234"))
+
+    assert result["title"] == "Test Article"
+    mock_zotero.item.assert_called_once_with("ABCD1234")
+
+
+def test_get_item_metadata_refetched_after_change(
+    mock_zotero: Any, sample_item: dict[str, Any], monkeypatch
+) -> None:
+    """Test that items modified in the library are evicted from the cache"""
+    monkeypatch.setattr("zotero_mcp.client.VERSION_CHECK_INTERVAL", 0)
+    sample_item = {**sample_item, "version": 5}
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.item_versions.return_value = {"ABCD1234": 6}
+
+    asyncio.run(get_item_metadata("ABCD1234"))
+    asyncio.run(get_item_metadata("ABCD1234"))
+
+    mock_zotero.item_versions.assert_called_once_with(since=5)
+    assert mock_zotero.item.call_count == 2
+
+
+def test_get_item_metadata_refetched_after_newer_item_cached(
+    mock_zotero: Any, sample_item: dict[str, Any], monkeypatch
+) -> None:
+    """Test that caching a newer item doesn't skip changes to older ones"""
+    monkeypatch.setattr("zotero_mcp.client.VERSION_CHECK_INTERVAL", 0)
+    older = {**sample_item, "version": 5}
+    newer = {**sample_item, "key": "EFGH5678", "version": 7}
+    mock_zotero.item.side_effect = {"ABCD1234": older, "EFGH5678": newer}.get
+    mock_zotero.item_versions.return_value = {}
+
+    asyncio.run(get_item_metadata("ABCD1234"))
+    # The older item changes after the check made while fetching the newer one
+    asyncio.run(get_item_metadata("EFGH5678"))
+    mock_zotero.item_versions.return_value = {"ABCD1234": 6, "EFGH5678": 7}
+    asyncio.run(get_item_metadata("ABCD1234"))
+
+    mock_zotero.item_versions.assert_called_with(since=5)
+    assert mock_zotero.item.call_count == 3
+
+
+def test_get_item_metadata_cached_when_version_check_fails(
+    mock_zotero: Any, sample_item: dict[str, Any], monkeypatch
+) -> None:
+    """Test that a failed check for changed items still serves the cache"""
+    monkeypatch.setattr("zotero_mcp.client.VERSION_CHECK_INTERVAL", 0)
+    sample_item = {**sample_item, "version": 5}
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.item_versions.side_effect = ConnectionError("Server unavailable")
+
+    asyncio.run(get_item_metadata("ABCD1234"))
+    result = asyncio.run(get_item_metadata("ABCD1234"))
+
+    assert result["title"] == "Test Article"
+    mock_zotero.item_versions.assert_called_once_with(since=5)
+    mock_zotero.item.assert_called_once()
+
+
+def test_get_item_fulltext_prefers_largest_pdf(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that the largest of several PDF attachments is used"""
+    larger_attachment = {
+        "key": "LARGE1",
+        "data": {**sample_attachment["data"], "key": "LARGE1"},
+        "links": {"enclosure": {"type": "application/pdf", "length": 200000}},
+    }
+    sample_attachment = {
+        **sample_attachment,
+        "links": {"enclosure": {"type": "application/pdf", "length": 1000}},
+    }
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.children.return_value = [sample_attachment, larger_attachment]
+    mock_zotero.fulltext_item.return_value = {"content": "Sample full text content"}
+
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    assert "Attachment Item Key: LARGE1" in result
+    mock_zotero.fulltext_item.assert_called_once_with("LARGE1")
+
+
+def test_get_item_fulltext_prefers_largest_pdf_after_search(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that a search's linked attachment doesn't override the ranking"""
+    larger_attachment = {
+        "key": "LARGE1",
+        "data": {**sample_attachment["data"], "key": "LARGE1"},
+        "links": {"enclosure": {"type": "application/pdf", "length": 200000}},
+    }
+    sample_attachment = {
+        **sample_attachment,
+        "links": {"enclosure": {"type": "application/pdf", "length": 1000}},
+    }
+    # Zotero links the oldest PDF, which here is the smaller one
+    sample_item = {
+        **sample_item,
+        "links": {
+            "attachment": {
+                "href": "https://api.zotero.org/users/1/items/XYZ789",
+                "attachmentType": "application/pdf",
+            }
+        },
+    }
+    mock_zotero.items.return_value = [sample_item]
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.children.return_value = [sample_attachment, larger_attachment]
+    mock_zotero.fulltext_item.return_value = {"content": "Sample full text content"}
+
+    asyncio.run(search_items("test"))
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    assert "Attachment Item Key: LARGE1" in result
+    mock_zotero.fulltext_item.assert_called_once_with("LARGE1")
+
+
+def test_get_item_fulltext_known_childless_item(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that a cached item without children skips the children lookup"""
+    sample_item = {**sample_item, "meta": {"numChildren": 0}}
+    mock_zotero.item.return_value = sample_item
+
+    asyncio.run(get_item_metadata("ABCD1234"))
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
 
     assert "No suitable attachment found" in result
+    mock_zotero.children.assert_not_called()
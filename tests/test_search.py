@@ -1,20 +1,35 @@
 """Tests for search functionality"""
 
+import asyncio
 from typing import Any
+from unittest.mock import call
 
-from zotero_mcp import search_items
+from zotero_mcp import get_item_fulltext, search_items
+from zotero_mcp.server import PREFETCH_LIMIT, prefetch_tasks
+
+
+async def search_and_prefetch(query: str) -> None:
+    """Search and wait for the attachments of results to be looked up"""
+    await search_items(query)
+    await asyncio.gather(*prefetch_tasks)
 
 
 def test_search_items_basic(mock_zotero: Any, sample_item: dict[str, Any]) -> None:
     """Test basic search functionality"""
     mock_zotero.items.return_value = [sample_item]
 
-    result = search_items("test")
+    result = asyncio.run(search_items("test"))
 
-    assert "Test Article" in result
-    assert "Item Key: ABCD1234" in result
-    assert "Authors: Doe, John; Smith, Jane" in result
-    assert "This is a test abstract" in result
+    assert result == [
+        {
+            "key": "ABCD1234",
+            "title": "Test Article",
+            "itemType": "journalArticle",
+            "date": "2024",
+            "authors": ["Doe, John", "Smith, Jane"],
+            "abstract": "This is a test abstract",
+        }
+    ]
 
     # Verify search parameters
     mock_zotero.add_parameters.assert_called_once_with(
@@ -26,7 +41,7 @@ def test_search_items_no_results(mock_zotero: Any) -> None:
     """Test search with no results"""
     mock_zotero.items.return_value = []
 
-    result = search_items("nonexistent")
+    result = asyncio.run(search_items("nonexistent"))
 
     assert "No items found" in result
 
@@ -37,8 +52,62 @@ def test_search_items_custom_params(
     """Test search with custom parameters"""
     mock_zotero.items.return_value = [sample_item]
 
-    search_items("test", qmode="everything", limit=5)
+    asyncio.run(search_items("test", qmode="everything", limit=5))
 
     mock_zotero.add_parameters.assert_called_once_with(
         q="test", qmode="everything", limit=5
     )
+
+
+def test_search_items_paginated(mock_zotero: Any, sample_item: dict[str, Any]) -> None:
+    """Test that limits above the API page size are split into pages"""
+    mock_zotero.items.return_value = [sample_item]
+
+    result = asyncio.run(search_items("test", limit=250))
+
+    assert [entry["key"] for entry in result] == ["ABCD1234"] * 3
+    mock_zotero.add_parameters.assert_has_calls(
+        [
+            call(q="test", qmode="titleCreatorYear", limit=100, start=0),
+            call(q="test", qmode="titleCreatorYear", limit=100, start=100),
+            call(q="test", qmode="titleCreatorYear", limit=50, start=200),
+        ],
+        any_order=True,
+    )
+
+
+def test_search_items_resolves_attachments(
+    mock_zotero: Any, sample_item: dict[str, Any], sample_attachment: dict[str, Any]
+) -> None:
+    """Test that attachments of results are resolved for later fulltext lookups"""
+    mock_zotero.items.return_value = [sample_item]
+    mock_zotero.item.return_value = sample_item
+    mock_zotero.children.return_value = [sample_attachment]
+    mock_zotero.fulltext_item.return_value = {"content": "Sample full text content"}
+
+    asyncio.run(search_and_prefetch("test"))
+    mock_zotero.children.assert_called_once_with("ABCD1234", itemType="attachment")
+
+    result = asyncio.run(get_item_fulltext("ABCD1234"))
+
+    assert "Attachment Item Key: XYZ789" in result
+    assert mock_zotero.children.call_count == 1
+
+
+def test_search_items_limits_prefetch(
+    mock_zotero: Any, sample_item: dict[str, Any]
+) -> None:
+    """Test that only the top results have attachments looked up"""
+    mock_zotero.items.return_value = [
+        {
+            **sample_item,
+            "key": f"ITEM{i}",
+            "data": {**sample_item["data"], "key": f"ITEM{i}"},
+        }
+        for i in range(PREFETCH_LIMIT + 3)
+    ]
+    mock_zotero.children.return_value = []
+
+    asyncio.run(search_and_prefetch("test"))
+
+    assert mock_zotero.children.call_count == PREFETCH_LIMIT
@@ -0,0 +1,157 @@
+"""Tests for the retrying and revalidating HTTP transports"""
+
+from dataclasses import dataclass, field
+
+import httpx
+import pytest
+
+from zotero_mcp.transport import ConditionalTransport, RetryTransport
+
+
+@dataclass
+class FakeServer:
+    responses: list[httpx.Response] = field(default_factory=list)
+    requests: list[httpx.Request] = field(default_factory=list)
+
+
+@pytest.fixture
+def server(monkeypatch) -> FakeServer:
+    """Fixture that answers transport requests with queued responses"""
+    fake = FakeServer()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        fake.requests.append(request)
+        return fake.responses.pop(0)
+
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", handle_request)
+    monkeypatch.setattr("zotero_mcp.transport.time.sleep", lambda seconds: None)
+    return fake
+
+
+def test_retries_transient_errors(server: FakeServer) -> None:
+    """Test that GET requests are retried until they succeed"""
+    server.responses = [
+        httpx.Response(503),
+        httpx.Response(429),
+        httpx.Response(200, text="ok"),
+    ]
+
+    with httpx.Client(transport=RetryTransport()) as client:
+        response = client.get("https://api.zotero.org/items")
+
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+
+
+def test_gives_up_after_total_retries(server: FakeServer) -> None:
+    """Test that the last error is returned once retries run out"""
+    server.responses = [httpx.Response(502) for _ in range(3)]
+
+    with httpx.Client(transport=RetryTransport(total=2)) as client:
+        response = client.get("https://api.zotero.org/items")
+
+    assert response.status_code == 502
+    assert len(server.requests) == 3
+
+
+def test_does_not_retry_writes(server: FakeServer) -> None:
+    """Test that non-idempotent requests are not retried"""
+    server.responses = [httpx.Response(503)]
+
+    with httpx.Client(transport=RetryTransport()) as client:
+        response = client.post("https://api.zotero.org/items")
+
+    assert response.status_code == 503
+    assert len(server.requests) == 1
+
+
+def test_revalidates_repeated_reads(server: FakeServer) -> None:
+    """Test that unchanged responses are answered from the cached body"""
+    server.responses = [
+        httpx.Response(200, headers={"Last-Modified-Version": "5"}, json=[1, 2]),
+        httpx.Response(304, headers={"Last-Modified-Version": "5"}),
+    ]
+
+    with httpx.Client(transport=ConditionalTransport()) as client:
+        first = client.get("https://api.zotero.org/items")
+        second = client.get("https://api.zotero.org/items")
+
+    assert first.json() == second.json() == [1, 2]
+    assert second.status_code == 200
+    assert "If-Modified-Since-Version" not in server.requests[0].headers
+    assert server.requests[1].headers["If-Modified-Since-Version"] == "5"
+
+
+def test_refreshes_changed_responses(server: FakeServer) -> None:
+    """Test that a changed response replaces the cached body"""
+    server.responses = [
+        httpx.Response(200, headers={"Last-Modified-Version": "5"}, json=[1]),
+        httpx.Response(200, headers={"Last-Modified-Version": "6"}, json=[2]),
+        httpx.Response(304, headers={"Last-Modified-Version": "6"}),
+    ]
+
+    with httpx.Client(transport=ConditionalTransport()) as client:
+        responses = [client.get("https://api.zotero.org/items") for _ in range(3)]
+
+    assert [response.json() for response in responses] == [[1], [2], [2]]
+    assert server.requests[2].headers["If-Modified-Since-Version"] == "6"
+
+
+def test_revalidation_uses_live_backoff(server: FakeServer) -> None:
+    """Test that a replayed body carries the 304's Backoff, not the original's"""
+    server.responses = [
+        httpx.Response(
+            200, headers={"Last-Modified-Version": "5", "Backoff": "30"}, json=[1]
+        ),
+        httpx.Response(304, headers={"Last-Modified-Version": "5"}),
+        httpx.Response(304, headers={"Last-Modified-Version": "5", "Backoff": "5"}),
+    ]
+
+    with httpx.Client(transport=ConditionalTransport()) as client:
+        responses = [client.get("https://api.zotero.org/items") for _ in range(3)]
+
+    assert responses[0].headers["Backoff"] == "30"
+    assert "Backoff" not in responses[1].headers
+    assert responses[2].headers["Backoff"] == "5"
+    assert responses[2].json() == [1]
+
+
+def test_skips_fulltext_responses(server: FakeServer) -> None:
+    """Test that full texts are left to the client's own cache"""
+    url = "https://api.zotero.org/users/1/items/XYZ789/fulltext"
+    server.responses = [
+        httpx.Response(200, headers={"Last-Modified-Version": "5"}, json={})
+        for _ in range(2)
+    ]
+
+    with httpx.Client(transport=ConditionalTransport()) as client:
+        client.get(url)
+        client.get(url)
+
+    assert "If-Modified-Since-Version" not in server.requests[1].headers
+
+
+def test_bounds_cached_bytes(server: FakeServer) -> None:
+    """Test that the oldest bodies are evicted once the byte budget is spent"""
+    server.responses = [
+        httpx.Response(200, headers={"Last-Modified-Version": "5"}, text="x" * 60)
+        for _ in range(3)
+    ]
+
+    with httpx.Client(transport=ConditionalTransport(maxbytes=100)) as client:
+        client.get("https://api.zotero.org/items/A")
+        client.get("https://api.zotero.org/items/B")
+        client.get("https://api.zotero.org/items/A")
+
+    assert "If-Modified-Since-Version" not in server.requests[2].headers
+
+
+def test_does_not_wait_for_long_retry_after(server: FakeServer) -> None:
+    """Test that a Retry-After beyond the maximum backoff is not waited for"""
+    server.responses = [httpx.Response(429, headers={"Retry-After": "600"})]
+
+    with httpx.Client(transport=RetryTransport()) as client:
+        response = client.get("https://api.zotero.org/items")
+
+    assert response.status_code == 429
+    assert len(server.requests) == 1